@@ -1,50 +1,167 @@
 import os
+import re
+import base64
 import sys
 import json
+import logging
 import boto3
 import uuid
+import time
+import hashlib
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from google import genai
 
 try:
-    from dotenv import load_dotenv
+    from aws_secretsmanager_caching import SecretCache, SecretCacheConfig
 except ImportError:
-    print("Python dotenv module not found. Skipping import.")
-    load_dotenv = None
+    print("aws-secretsmanager-caching module not found. Secrets will not be cached.")
+    SecretCache = None
 
-def success_response(data, status_code=200):
-    """Create success response"""
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the standard library json module
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    # msgpack is optional; queued payloads fall back to JSON
+    msgpack = None
+
+# Verbose payload dumps go through the logger so they are only formatted when enabled
+logger = logging.getLogger()
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
+def json_dumps(data):
+    """Serialize data to a JSON string, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data)
+
+def json_loads(data):
+    """Parse a JSON string, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Shared by every response; the runtime only serializes it, never mutates it
+CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type',
+    'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
+}
+
+def json_response(body, status_code):
+    """Wrap an already-serialized JSON body in an API Gateway response"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type',
-            'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
-        },
-        'body': json.dumps(data)
+        'headers': CORS_HEADERS,
+        'body': body
     }
 
+def success_response(data, status_code=200):
+    """Create success response"""
+    return json_response(json_dumps(data), status_code)
+
 def error_response(message, status_code=500):
     """Create error response"""
-    return {
-        'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type',
-            'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
-        },
-        'body': json.dumps({'error': message})
-    }
-
-# Initialize AWS clients
-secrets_client = boto3.client('secretsmanager')
-lambda_client = boto3.client('lambda')
+    return json_response(json_dumps({'error': message}), status_code)
+
+# Initialize AWS clients (keep-alive pooled connections, reused across warm invocations)
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=10,
+    retries={'mode': 'adaptive', 'max_attempts': 3},
+    tcp_keepalive=True
+)
+secrets_client = boto3.client('secretsmanager', config=AWS_CLIENT_CONFIG)
+lambda_client = boto3.client('lambda', config=AWS_CLIENT_CONFIG)
+sqs_client = boto3.client('sqs', config=AWS_CLIENT_CONFIG)
+events_client = boto3.client('events', config=AWS_CLIENT_CONFIG)
+dynamodb = boto3.resource('dynamodb', config=AWS_CLIENT_CONFIG)
+
+# Gemini responses shared across containers, keyed by prompt hash (TTL on expires_at).
+# Opt-in: set SUGGESTIONS_CACHE_TABLE_NAME to the SuggestionsCacheTable name and
+# grant the function dynamodb:GetItem and dynamodb:PutItem on it
+SUGGESTIONS_CACHE_TABLE_NAME = os.environ.get('SUGGESTIONS_CACHE_TABLE_NAME')
+SUGGESTIONS_CACHE_TTL = 86400
+suggestions_cache_table = dynamodb.Table(SUGGESTIONS_CACHE_TABLE_NAME) if SUGGESTIONS_CACHE_TABLE_NAME else None
+
+# In-memory secret cache, refreshed hourly, shared across warm invocations
+secret_cache = SecretCache(
+    config=SecretCacheConfig(secret_refresh_interval=3600),
+    client=secrets_client
+) if SecretCache else None
+
+# When set, sessions are handed to Service 5 through SQS instead of an async Lambda invoke
+SERVICE5_QUEUE_URL = os.environ.get('SERVICE5_QUEUE_URL')
+
+# When set, sessions are published to this EventBridge bus for a rule targeting Service 5
+SERVICE5_EVENT_BUS_NAME = os.environ.get('SERVICE5_EVENT_BUS_NAME')
+SERVICE5_EVENT_SOURCE = 'ai-demo.service4'
 
 # checking if the current running environment is AWS or Local
 IS_LAMBDA = bool(os.environ.get('AWS_LAMBDA_FUNCTION_NAME'))
 
+# Port of the AWS Parameters and Secrets Lambda Extension. The layer listens on
+# 2773 unless overridden; without the layer the connection is refused at once
+# and secrets fall back to the SDK
+SECRETS_EXTENSION_PORT = os.environ.get('PARAMETERS_SECRETS_EXTENSION_HTTP_PORT', '2773')
+
+def get_secret_from_extension(secret_name):
+    """
+    Read a secret through the Parameters and Secrets Lambda Extension, which
+    caches it locally (SECRETS_MANAGER_TTL) instead of calling Secrets Manager
+
+    Returns:
+        str: SecretString of the secret
+    """
+    url = (
+        f"http://localhost:{SECRETS_EXTENSION_PORT}/secretsmanager/get"
+        f"?secretId={urllib.parse.quote(secret_name, safe='')}"
+    )
+    request = urllib.request.Request(
+        url,
+        headers={'X-Aws-Parameters-Secrets-Token': os.environ.get('AWS_SESSION_TOKEN', '')}
+    )
+    with urllib.request.urlopen(request, timeout=2) as response:
+        return json.loads(response.read()).get('SecretString')
+
+def get_secrets(secret_names):
+    """
+    Fetch several secrets at once, from the Lambda extension or in-memory
+    cache when available, or with a single BatchGetSecretValue call otherwise
+
+    Returns:
+        dict: Secret name -> SecretString for every secret that was found
+    """
+    if IS_LAMBDA:
+        try:
+            return {name: get_secret_from_extension(name) for name in secret_names}
+        except Exception as e:
+            print(f"[Service 4] ⚠️ Secrets extension unavailable, using the SDK: {str(e)}")
+
+    if secret_cache:
+        return {name: secret_cache.get_secret_string(name) for name in secret_names}
+
+    response = secrets_client.batch_get_secret_value(SecretIdList=list(secret_names))
+
+    for error in response.get('Errors', []):
+        print(f"[Service 4] ❌ Failed to fetch secret {error.get('SecretId')}: {error.get('ErrorCode')}")
+
+    # Secrets may be requested by name or ARN; key the result the way they were asked for
+    secrets = {}
+    for secret in response.get('SecretValues', []):
+        secret_id = secret['ARN'] if secret['ARN'] in secret_names else secret['Name']
+        secrets[secret_id] = secret.get('SecretString')
+    return secrets
+
 def get_gemini_api_key():
     """
     Get Gemini API key from environment variables (local) or AWS Secrets Manager (production)
@@ -55,17 +172,19 @@ def get_gemini_api_key():
     api_key = os.environ.get('GEMINI_API_KEY')
 
     if api_key:
-        print(f"[Service 4] ✅ ❌ Found API key in environment variables {api_key}")
-    else:
-        print(f"[Service 4] API key not found in environment variables")
-    
-    print(f"[Service 4] ✅ ❌❌❌ API key in environment variables {api_key}")
-    
-    return api_key
+        print("[Service 4] ✅ Found API key in environment variables")
+        return api_key
+
+    print("[Service 4] API key not found in environment variables")
 
     # if testing locally
     if not IS_LAMBDA:
-        load_dotenv()
+        # python-dotenv is a dev-only dependency, so it is never imported on Lambda
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+        except ImportError:
+            print("Python dotenv module not found. Skipping .env file.")
         print(f"[Service 4] Running file on local computer. Fetched the key from .env file")
         api_key = os.environ.get('GEMINI_API_KEY')
         return api_key
@@ -75,11 +194,9 @@ def get_gemini_api_key():
 
         try:
             print(f"[Service 4] Fetching API key from Secrets Manager: {secret_name}")
-            response = secrets_client.get_secret_value(SecretId=secret_name)
-
-            if 'SecretString' in response:
-                secret = response['SecretString']
+            secret = get_secrets([secret_name]).get(secret_name)
 
+            if secret:
                 # trying to check if a dictionary is received
                 try:
                     secret_dict = json.loads(secret)
@@ -105,23 +222,199 @@ def get_gemini_api_key():
             return None
 
         except Exception as e:
-            print(f"[Service 4] ❌ Unexpected error fetching API key: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[Service 4] ❌ Unexpected error fetching API key: %s", e)
             return None
 
-# initializing the gemini client      
-GEMINI_API_KEY = get_gemini_api_key()
+def import_genai():
+    """Load the google-genai SDK so building the client later finds it already imported"""
+    from google import genai
+    return genai
+
+# Start fetching the API key and importing the SDK on separate background
+# threads during cold start, so the Secrets Manager round trip and the heavy
+# import overlap each other and the rest of module init
+prefetch_executor = ThreadPoolExecutor(max_workers=2)
+gemini_api_key_future = prefetch_executor.submit(get_gemini_api_key)
+genai_import_future = prefetch_executor.submit(import_genai)
+
+GEMINI_MODEL = "gemini-2.0-flash"
+
+# Gemini client, created on first use and reused across warm invocations
 client = None
+gemini_client_lock = threading.Lock()
+
+def get_gemini_client():
+    """
+    Get the Gemini client, initializing it on first use.
+    A failed initialization is retried on the next invocation instead of
+    leaving the container on fallback suggestions for its whole lifetime.
+
+    Returns:
+        genai.Client or None if no API key is available
+    """
+    global client, gemini_api_key_future
+
+    # Fast path for warm invocations: no lock once the client exists
+    if client is not None:
+        return client
+
+    # The warm-up thread and the handler may both get here during cold start
+    with gemini_client_lock:
+        if client is None:
+            try:
+                if gemini_api_key_future is not None:
+                    # Only the first attempt uses the prefetched key; retries fetch again
+                    key_future, gemini_api_key_future = gemini_api_key_future, None
+                    api_key = key_future.result()
+                else:
+                    api_key = get_gemini_api_key()
+                if api_key:
+                    # Normally already loaded by the prefetch thread; the import
+                    # lock makes this wait if that import is still running
+                    from google import genai
+                    client = genai.Client(api_key=api_key)
+                    print("[Service 4] ✅ Gemini client initialized successfully")
+                else:
+                    print("[Service 4] ⚠️ GEMINI_API_KEY not found - will use fallback suggestions")
+            except Exception as e:
+                print(f"[Service 4] ❌ Failed to initialize Gemini client: {str(e)}")
+
+    return client
+
+def warm_gemini_connection():
+    """
+    Create the Gemini client and make one cheap metadata call so the TLS
+    handshake to the Gemini API happens during init rather than inside the
+    first billed invocation. Failures are ignored.
+    """
+    try:
+        gemini_client = get_gemini_client()
+        if gemini_client:
+            gemini_client.models.get(model=GEMINI_MODEL)
+            print("[Service 4] ✅ Gemini connection warmed")
+    except Exception as e:
+        print(f"[Service 4] ⚠️ Gemini connection warm-up failed (non-critical): {str(e)}")
+
+# Seconds module init waits for the warm-up; past this the handshake simply
+# finishes in the background during the first invocation
+GEMINI_WARMUP_TIMEOUT = float(os.environ.get('GEMINI_WARMUP_TIMEOUT', '2'))
+
+if IS_LAMBDA:
+    try:
+        prefetch_executor.submit(warm_gemini_connection).result(timeout=GEMINI_WARMUP_TIMEOUT)
+    except FuturesTimeoutError:
+        print("[Service 4] ⚠️ Gemini connection warm-up still running after init (non-critical)")
+
+# Recent Gemini responses keyed by prompt hash, reused by warm containers
+GEMINI_CACHE_MAX_ENTRIES = 128
+gemini_response_cache = OrderedDict()
+
+def remember_gemini_response(prompt_hash, response_text):
+    """Store a response in the in-memory cache, evicting the oldest entry"""
+    gemini_response_cache[prompt_hash] = response_text
+    gemini_response_cache.move_to_end(prompt_hash)
+    if len(gemini_response_cache) > GEMINI_CACHE_MAX_ENTRIES:
+        gemini_response_cache.popitem(last=False)
+
+def get_cached_suggestions(prompt_hash):
+    """
+    Look up a Gemini response generated by any container for the same prompt
+
+    Returns:
+        str: Cached response text, or None on miss/expiry/error
+    """
+    if suggestions_cache_table is None:
+        return None
+    try:
+        item = suggestions_cache_table.get_item(Key={'prompt_hash': prompt_hash}).get('Item')
+        # DynamoDB TTL deletes lazily, so skip items that have already expired
+        if item and int(item.get('expires_at', 0)) > int(time.time()):
+            return item.get('response_text')
+    except Exception as e:
+        print(f"[Service 4] ⚠️ Suggestions cache read failed (non-critical): {str(e)}")
+    return None
 
-if GEMINI_API_KEY:
+def put_cached_suggestions(prompt_hash, response_text):
+    """Persist a Gemini response so other containers can reuse it"""
+    if suggestions_cache_table is None:
+        return
     try:
-        client = genai.Client(api_key=GEMINI_API_KEY)
-        print("[Service 4] ✅ Gemini client initialized successfully")
+        suggestions_cache_table.put_item(Item={
+            'prompt_hash': prompt_hash,
+            'response_text': response_text,
+            'expires_at': int(time.time()) + SUGGESTIONS_CACHE_TTL
+        })
     except Exception as e:
-        print(f"[Service 4] ❌ Failed to initialize Gemini client: {str(e)}")
-else:
-    print("[Service 4] ⚠️ GEMINI_API_KEY not found - will use fallback suggestions")
+        print(f"[Service 4] ⚠️ Suggestions cache write failed (non-critical): {str(e)}")
+
+def generate_gemini_content(client, prompt, prompt_hash):
+    """
+    Call Gemini with the prompt, reusing the response text if this container
+    or the shared DynamoDB cache already holds one for an identical prompt
+
+    Returns:
+        tuple: (raw response text, True if it was served from a cache)
+    """
+    cached_text = gemini_response_cache.get(prompt_hash)
+    if cached_text is not None:
+        gemini_response_cache.move_to_end(prompt_hash)
+        print("[Service 4] ✅ Reusing cached Gemini response")
+        return cached_text, True
+
+    cached_text = get_cached_suggestions(prompt_hash)
+    if cached_text is not None:
+        print("[Service 4] ✅ Reusing Gemini response from DynamoDB cache")
+        remember_gemini_response(prompt_hash, cached_text)
+        return cached_text, True
+
+    print("[Service 4] Calling Gemini API...")
+    response = client.models.generate_content(
+        model=GEMINI_MODEL,
+        contents=prompt
+    )
+
+    print("[Service 4] ✅ Received response from Gemini")
+
+    return response.text, False
+
+def send_to_service5_queue(payload):
+    """
+    Queue the session payload for Service 5, MessagePack-encoded when msgpack
+    is installed (smaller and cheaper to encode than JSON). The content-type
+    message attribute tells Service 5 how to decode the body.
+    """
+    if msgpack is not None:
+        body = base64.b64encode(msgpack.packb(payload, use_bin_type=True)).decode('ascii')
+        content_type = 'application/msgpack'
+    else:
+        body = json_dumps(payload)
+        content_type = 'application/json'
+
+    response = sqs_client.send_message(
+        QueueUrl=SERVICE5_QUEUE_URL,
+        MessageBody=body,
+        MessageAttributes={
+            'content-type': {'DataType': 'String', 'StringValue': content_type}
+        }
+    )
+
+    print(f"[Service 4] ✅ Session queued for Service 5 (MessageId: {response['MessageId']})")
+
+def publish_session_event(payload):
+    """Publish the session payload as a SessionCreated event for Service 5"""
+    response = events_client.put_events(Entries=[{
+        'Source': SERVICE5_EVENT_SOURCE,
+        'DetailType': 'SessionCreated',
+        'Detail': json_dumps(payload),
+        'EventBusName': SERVICE5_EVENT_BUS_NAME
+    }])
+
+    # PutEvents reports per-entry failures instead of raising
+    if response.get('FailedEntryCount'):
+        entry = response['Entries'][0]
+        raise RuntimeError(f"{entry.get('ErrorCode')}: {entry.get('ErrorMessage')}")
+
+    print(f"[Service 4] ✅ Session event published for Service 5 (EventId: {response['Entries'][0]['EventId']})")
 
 def invoke_service5_async(session_id, github_data, project_analysis, suggestions, project_metadata):
     """
@@ -139,13 +432,22 @@ def invoke_service5_async(session_id, github_data, project_analysis, suggestions
             'project_metadata': project_metadata
         }
         
+        if SERVICE5_EVENT_BUS_NAME:
+            publish_session_event(payload)
+            return
+
+        if SERVICE5_QUEUE_URL:
+            send_to_service5_queue(payload)
+            return
+
         print(f"[Service 4] Invoking Service 5 asynchronously: {service5_function_name}")
         
         # ASYNC invocation - fire and forget
         response = lambda_client.invoke(
             FunctionName=service5_function_name,
             InvocationType='Event',  # ASYNC - don't wait for response
-            Payload=json.dumps(payload)
+            # Invoke accepts bytes, so skip decoding orjson's output
+            Payload=orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS) if orjson is not None else json_dumps(payload)
         )
         
         print(f"[Service 4] ✅ Service 5 invoked asynchronously (StatusCode: {response['StatusCode']})")
@@ -155,6 +457,56 @@ def invoke_service5_async(session_id, github_data, project_analysis, suggestions
         print(f"[Service 4] ⚠️ Failed to invoke Service 5 (non-critical): {str(e)}")
 
 
+# Upper bound on README text accepted from upstream services
+MAX_README_CHARS = 100_000
+
+# Lambda caps synchronous responses at 6 MB (bytes), including the escaped body string
+MAX_RESPONSE_BODY_BYTES = 5_000_000
+
+# Per-video limits applied only when a response would exceed the size cap
+MAX_NARRATION_CHARS = 2000
+MAX_RECORD_STEPS = 20
+MAX_RECORD_STEP_CHARS = 500
+
+def trim_video_fields(videos):
+    """Truncate the free-text fields that dominate an oversized response"""
+    for video in videos:
+        if not isinstance(video, dict):
+            continue
+        narration = video.get('narration_script')
+        if isinstance(narration, str):
+            video['narration_script'] = narration[:MAX_NARRATION_CHARS]
+        steps = video.get('what_to_record')
+        if isinstance(steps, list):
+            video['what_to_record'] = [
+                step[:MAX_RECORD_STEP_CHARS] if isinstance(step, str) else step
+                for step in steps[:MAX_RECORD_STEPS]
+            ]
+
+def build_response_data(session_id, project_name, owner, suggestion_data,
+                        project_type, language, stars, complexity):
+    """Assemble the response body returned to the frontend"""
+    videos = suggestion_data.get('videos', [])
+
+    return {
+        'session_id': session_id,
+        'project_name': project_name,
+        'owner': owner,
+        'github_url': f"https://github.com/{owner}/{project_name}" if owner != 'unknown' else None,
+        'videos': videos,
+        'total_suggestions': len(videos),
+        'overall_flow': suggestion_data.get('overall_flow', ''),
+        'total_estimated_duration': suggestion_data.get('total_estimated_duration', ''),
+        'project_specific_tips': suggestion_data.get('project_specific_tips', []),
+        'project_metadata': {
+            'type': project_type,
+            'language': language,
+            'stars': stars,
+            'complexity': complexity
+        }
+    }
+
+
 def lambda_handler(event, context):
     """
     Service 4: AI Suggestions Service
@@ -162,17 +514,17 @@ def lambda_handler(event, context):
     """
     try:
         print("[Service 4] Starting AI Suggestions Generator")
-        print(f"[Service 4] Event: {json.dumps(event)}")
+        logger.debug("[Service 4] Event: %s", event)
 
         if 'body' in event:
             # API Gateway Format (Http request)
             print("[Service 4] Processing API Gateway Event")
-            body = json.loads(event['body']) if isinstance(event['body'], str) else event['body']
+            body = json_loads(event['body']) if isinstance(event['body'], str) else event['body']
         else:
             print("[Service 4] Processing direct invocation")
             body = event
         
-        print(f"[Service 4] Parsed body keys: {list(body.keys())}")
+        logger.debug("[Service 4] Parsed body keys: %s", list(body))
 
         if 'value' in body:
             # Frontend sent the complete response from Person 1
@@ -201,7 +553,9 @@ def lambda_handler(event, context):
         owner = github_data.get('owner', 'unknown')
         stars = github_data.get('stars', 0)
         language = github_data.get('language', 'Unknown')
-        readme_content = github_data.get('readme', '')
+        # Guard against a misbehaving upstream sending a huge README; the prompt
+        # only uses the first few thousand characters anyway
+        readme_content = github_data.get('readme', '')[:MAX_README_CHARS]
         project_type = project_analysis.get('projectType', 'Unknown')
 
         print(f"[Service 4] Project: {owner}/{project_name}")
@@ -221,40 +575,50 @@ def lambda_handler(event, context):
 
         # TODO: Invoke Service 5 asynchronously to store in session table
 
-        response_data =  {
-            'session_id': session_id,
-            'project_name': project_name,
-            'owner': owner,
-            'github_url': f"https://github.com/{owner}/{project_name}",
-            'videos': suggestion_data.get('videos', []),
-            'total_suggestions': len(suggestion_data.get('videos', [])),
-            'overall_flow': suggestion_data.get('overall_flow', ''),
-            'total_estimated_duration': suggestion_data.get('total_estimated_duration', ''),
-            'project_specific_tips': suggestion_data.get('project_specific_tips', []),
-            'project_metadata': {
-                'type': project_type,
-                'language': language,
-                'stars': stars,
-                'complexity': project_analysis.get('complexity', 'unknown')
-            }
-        }
+        is_fallback = suggestion_data.pop('_is_fallback', False)
 
-        # Asynchronously invoke Service 5 to store session (fire-and-forget)
-        invoke_service5_async(
+        response_data = build_response_data(
             session_id=session_id,
-            github_data=github_data,
-            project_analysis=project_analysis,
-            suggestions=suggestion_data,
-            project_metadata=response_data['project_metadata']
+            project_name=project_name,
+            owner=owner,
+            suggestion_data=suggestion_data,
+            project_type=project_type,
+            language=language,
+            stars=stars,
+            complexity=project_analysis.get('complexity', 'unknown')
         )
 
-        return success_response(response_data)
+        # Asynchronously invoke Service 5 to store session (fire-and-forget).
+        # Generic fallback suggestions carry nothing project-specific, so skip storing them
+        if is_fallback:
+            print("[Service 4] Fallback suggestions used - not storing session")
+        else:
+            invoke_service5_async(
+                session_id=session_id,
+                github_data=github_data,
+                project_analysis=project_analysis,
+                suggestions=suggestion_data,
+                project_metadata=response_data['project_metadata']
+            )
+
+        # Serialize once; only trim and re-serialize if the body would exceed
+        # the 6 MB Lambda response limit (headroom left for escaping)
+        body = json_dumps(response_data)
+        body_bytes = len(body.encode('utf-8'))
+        if body_bytes > MAX_RESPONSE_BODY_BYTES:
+            print(f"[Service 4] ⚠️ Response body too large ({body_bytes} bytes), trimming video fields")
+            trim_video_fields(response_data['videos'])
+            body = json_dumps(response_data)
+            body_bytes = len(body.encode('utf-8'))
+            if body_bytes > MAX_RESPONSE_BODY_BYTES:
+                print(f"[Service 4] ❌ Response body still too large after trimming ({body_bytes} bytes)")
+                return error_response('Generated suggestions exceed the response size limit', 502)
+
+        return json_response(body, 200)
 
     
     except Exception as e:
-        print(f"[Service 4] ❌ Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[Service 4] ❌ Error: %s", e)
         return error_response(str(e))
     
 
@@ -263,6 +627,7 @@ def generate_video_suggestions(project_name, readme_content, project_type, proje
     Use Gemini API to generate video demo suggestions
     """
     try:
+        client = get_gemini_client()
         if not client:
             print("[Service 4] ⚠️ Gemini client not initialized, using fallback")
             return create_fallback_suggestions(project_name, project_type)
@@ -277,47 +642,29 @@ def generate_video_suggestions(project_name, readme_content, project_type, proje
             github_data=github_data
         )
 
-        print("[Service 4] Calling Gemini API...")
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt
-        )
-
-        print("[Service 4] ✅ Received response from Gemini")
+        prompt_hash = hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).hexdigest()
+        response_text, from_cache = generate_gemini_content(client, prompt, prompt_hash)
 
         # Parse the response
-        suggestions = parse_gemini_response(response.text)
+        suggestions = parse_gemini_response(response_text)
+        parsed_json = not suggestions.pop('_from_text', False)
+
+        # Only cache replies that parsed into videos, so a truncated or
+        # non-JSON reply is retried on the next identical prompt instead of
+        # being served by every container for the full TTL
+        if not from_cache and parsed_json and suggestions['videos']:
+            remember_gemini_response(prompt_hash, response_text)
+            put_cached_suggestions(prompt_hash, response_text)
+
         return suggestions
     
     except Exception as e:
-        print(f"[Service 4] ❌ Gemini API Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[Service 4] ❌ Gemini API Error: %s", e)
         return create_fallback_suggestions(project_name, project_type)
     
 
-def create_gemini_prompt(project_name, readme_content, project_type, 
-                         project_analysis, parsed_readme, github_data):
-    """Create adaptive prompt that works for ANY project type"""
-    max_readme_length = 3000
-    if len(readme_content) > max_readme_length:
-        readme_content = readme_content[:max_readme_length] + "..."
-
-    tech_stack = project_analysis.get('techStack', [])
-    key_features = project_analysis.get('keyFeatures', [])
-    suggested_segments = project_analysis.get('suggestedSegments', 3)
-    complexity = project_analysis.get('complexity', 'medium')
-    features = parsed_readme.get('features', [])
-    owner = github_data.get('owner', 'unknown')
-    stars = github_data.get('stars', 0)
-    language = github_data.get('language', 'Unknown')
-    description = github_data.get('description', '')
-
-    tech_stack_str = ', '.join(tech_stack) if tech_stack else 'Not Specified'
-    key_features_str = '\n- '.join(key_features) if key_features else 'Not Specified'
-    features_str = '\n- '.join(features) if features else 'Not Specified'
-
-    prompt = f"""You are an expert at creating detailed video demo scripts for GitHub projects of ANY type.
+# Per-project prompt header, filled in per invocation by create_gemini_prompt
+GEMINI_PROMPT_TEMPLATE = """You are an expert at creating detailed video demo scripts for GitHub projects of ANY type.
 
 PROJECT INFORMATION:
 - Name: {project_name}
@@ -351,8 +698,11 @@ IMPORTANT: Analyze the project type and adapt your suggestions accordingly:
 **For DESKTOP APPS:** Focus on UI features, workflows, settings
 
 TASK:
-Create {min(3, suggested_segments)} video suggestions that will be recorded by a user and merged together into a final demo video.
+Create {video_count} video suggestions that will be recorded by a user and merged together into a final demo video.
+"""
 
+# Static instructions and JSON schema appended verbatim after the formatted header
+GEMINI_PROMPT_STATIC_TAIL = """
 For EACH video, provide SPECIFIC, ACTIONABLE recording instructions adapted to this project's type.
 
 EXAMPLES OF GOOD "what_to_record" INSTRUCTIONS:
@@ -383,9 +733,9 @@ EXAMPLES OF GOOD "what_to_record" INSTRUCTIONS:
 - "Swipe left to see the saved item in the list"
 
 For each video, provide:
-{{
+{
     "videos": [
-        {{
+        {
             "sequence_number": 1,
             "title": "string - Clear title indicating what will be shown",
             "duration": "string - e.g., '1.5 minutes'",
@@ -401,14 +751,14 @@ For each video, provide:
                 "Important feature/concept to emphasize",
                 "Another highlight"
             ],
-            "technical_setup": {{
+            "technical_setup": {
                 "prerequisites": ["Software needed", "Accounts required", "Data to prepare"],
                 "environment": "Description of environment (browser, terminal, IDE, etc.)",
                 "sample_data": "Any sample data/inputs needed"
-            }},
+            },
             "expected_outcome": "What the viewer should see by the end of this video",
             "transition_to_next": "How this connects to next video"
-        }}
+        }
     ],
     "overall_flow": "Brief description of the complete story these videos tell",
     "total_estimated_duration": "X minutes",
@@ -416,7 +766,7 @@ For each video, provide:
         "Recording tip specific to this type of project",
         "Another relevant tip"
     ]
-}}
+}
 
 CRITICAL INSTRUCTIONS:
 1. **Adapt to project type** - Don't give web app instructions for a CLI tool!
@@ -428,8 +778,46 @@ CRITICAL INSTRUCTIONS:
 7. **Logical progression** - Each video should naturally lead to the next
 
 Return ONLY valid JSON, nothing else."""
-    
-    return prompt
+
+def create_gemini_prompt(project_name, readme_content, project_type, 
+                         project_analysis, parsed_readme, github_data):
+    """Create adaptive prompt that works for ANY project type"""
+    max_readme_length = 3000
+    readme_excerpt = (
+        readme_content if len(readme_content) <= max_readme_length
+        else f"{readme_content[:max_readme_length]}..."
+    )
+
+    tech_stack = project_analysis.get('techStack', [])
+    key_features = project_analysis.get('keyFeatures', [])
+    suggested_segments = project_analysis.get('suggestedSegments', 3)
+    complexity = project_analysis.get('complexity', 'medium')
+    features = parsed_readme.get('features', [])
+    owner = github_data.get('owner', 'unknown')
+    stars = github_data.get('stars', 0)
+    language = github_data.get('language', 'Unknown')
+    description = github_data.get('description', '')
+
+    tech_stack_str = ', '.join(tech_stack) if tech_stack else 'Not Specified'
+    key_features_str = '\n- '.join(key_features) if key_features else 'Not Specified'
+    features_str = '\n- '.join(features) if features else 'Not Specified'
+
+    header = GEMINI_PROMPT_TEMPLATE.format_map({
+        'project_name': project_name,
+        'owner': owner,
+        'stars': stars,
+        'language': language,
+        'project_type': project_type,
+        'complexity': complexity,
+        'description': description,
+        'tech_stack_str': tech_stack_str,
+        'key_features_str': key_features_str,
+        'features_str': features_str,
+        'readme_content': readme_excerpt,
+        'video_count': min(3, suggested_segments)
+    })
+    return header + GEMINI_PROMPT_STATIC_TAIL
+
 
 
 def parse_gemini_response(response_text):
@@ -438,18 +826,16 @@ def parse_gemini_response(response_text):
     """
     try:
         # Clean up the response (remove markdown code blocks if present)
-        response_text = response_text.strip()
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
+        response_text = (
+            response_text.strip()
+            .removeprefix('```json')
+            .removeprefix('```')
+            .removesuffix('```')
+            .strip()
+        )
         
         # Parse JSON
-        data = json.loads(response_text)
+        data = json_loads(response_text)
         
         # Extract all relevant fields
         videos = data.get('videos', [])
@@ -469,52 +855,55 @@ def parse_gemini_response(response_text):
         
     except json.JSONDecodeError as e:
         print(f"[Service 4] ⚠️ Failed to parse Gemini response as JSON: {str(e)}")
-        print(f"[Service 4] Raw response: {response_text[:500]}...")
+        logger.debug("[Service 4] Raw response: %.500s...", response_text)
         
+        videos = extract_suggestions_from_text(response_text)
+        if not videos:
+            # Nothing usable in the text either; flag it so the session is not stored
+            suggestions = create_fallback_suggestions("Project", "Unknown")
+            suggestions['_from_text'] = True
+            return suggestions
+
         return {
-            'videos': extract_suggestions_from_text(response_text),
+            '_from_text': True,
+            'videos': videos,
             'overall_flow': '',
             'total_estimated_duration': '',
             'project_specific_tips': []
         }
 
 
+# Numbered ("1." - "3.") or bulleted ("-", "*") lines in a plain-text Gemini reply
+BULLET_RE = re.compile(r'^[ \t]*(?:[123]\.|[-*])(.*)$', re.MULTILINE)
+
 def extract_suggestions_from_text(text):
     """
-    Fallback: Try to extract video ideas from plain text response
+    Fallback: Try to extract video ideas from plain text response.
+    Returns an empty list when the text has no usable bullet lines.
     """
     suggestions = []
-    lines = text.split('\n')
-    current_suggestion = None
-    
-    for line in lines:
-        line = line.strip()
-        if line.startswith(('1.', '2.', '3.', '-', '*')) and len(line) > 10:
-            if current_suggestion:
-                suggestions.append(current_suggestion)
-            
-            current_suggestion = {
-                'sequence_number': len(suggestions) + 1,
-                'title': line.split('.', 1)[-1].strip().strip('-*').strip(),
-                'duration': '1-2 minutes',
-                'video_type': 'feature_demo',
-                'what_to_record': [line.split('.', 1)[-1].strip().strip('-*').strip()],
-                'narration_script': '',
-                'key_highlights': [],
-                'technical_setup': {
-                    'prerequisites': [],
-                    'environment': 'General',
-                    'sample_data': ''
-                },
-                'expected_outcome': '',
-                'transition_to_next': ''
-            }
-    
-    if current_suggestion:
-        suggestions.append(current_suggestion)
-    
-    if not suggestions:
-        return create_fallback_suggestions("Project", "Unknown")
+
+    for match in BULLET_RE.finditer(text):
+        if len(match.group(0).strip()) <= 10:
+            continue
+
+        step = match.group(1).strip()
+        suggestions.append({
+            'sequence_number': len(suggestions) + 1,
+            'title': step,
+            'duration': '1-2 minutes',
+            'video_type': 'feature_demo',
+            'what_to_record': [step],
+            'narration_script': '',
+            'key_highlights': [],
+            'technical_setup': {
+                'prerequisites': [],
+                'environment': 'General',
+                'sample_data': ''
+            },
+            'expected_outcome': '',
+            'transition_to_next': ''
+        })
     
     return suggestions
 
@@ -522,6 +911,7 @@ def extract_suggestions_from_text(text):
 def create_fallback_suggestions(project_name, project_type):
     """Create generic fallback suggestions if Gemini fails"""
     return {
+        '_is_fallback': True,
         'videos': [
             {
                 'sequence_number': 1,
@@ -1,97 +1,178 @@
 import json
 import os
+import re
+import base64
+import traceback
 import boto3
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-# Initialize DynamoDB
-dynamodb = boto3.resource('dynamodb')
+# Initialize DynamoDB (keep-alive + adaptive retries, reused across warm invocations)
+dynamodb = boto3.resource('dynamodb', config=Config(
+    max_pool_connections=64,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    tcp_keepalive=True
+))
 SESSIONS_TABLE_NAME = os.environ.get('SESSIONS_TABLE_NAME', 'ai-demo-sessions')
+SESSION_TTL_SECONDS = 30 * 24 * 60 * 60
+sessions_table = dynamodb.Table(SESSIONS_TABLE_NAME)
+
+try:
+    import msgpack
+except ImportError:
+    # Only needed when Service 4 queues MessagePack-encoded sessions
+    msgpack = None
 
 def lambda_handler(event, context):
     """
     Service 5: Session Manager
     Single Responsibility: Store Session Data in DynamoDB
+
+    Accepts a direct async invoke from Service 4, an SQS batch of queued
+    sessions, or a SessionCreated event delivered by an EventBridge rule.
     """
+    if 'Records' in event:
+        return store_session_batch(event['Records'])
+
+    if event.get('detail-type') == 'SessionCreated':
+        return store_session(event['detail'])
+
+    return store_session(event)
+
+
+def store_session_batch(records):
+    """
+    Store a batch of queued sessions with BatchWriteItem (up to 25 items per
+    call) and report undecodable or invalid records as partial batch failures
+    so SQS only retries those
+    """
+    print(f"[Service 5] Storing {len(records)} queued sessions in {SESSIONS_TABLE_NAME}")
+
+    failures = []
+    items = []
+    for record in records:
+        try:
+            items.append((record['messageId'], build_session_item(decode_sqs_record(record))))
+        except Exception as e:
+            print(f"[Service 5] ❌ Skipping record {record.get('messageId')}: {str(e)}")
+            failures.append({'itemIdentifier': record['messageId']})
+
     try:
-        print("[Service 5] Starting Session Manager")
-        print(f"[Service 5] Table: {SESSIONS_TABLE_NAME}")
+        with sessions_table.batch_writer() as batch:
+            for _, item in items:
+                batch.put_item(Item=item)
+        print(f"[Service 5] ✅ Stored {len(items)} sessions")
+    except ClientError as e:
+        print(f"[Service 5] ❌ DynamoDB batch write failed: {str(e)}")
+        failures.extend({'itemIdentifier': message_id} for message_id, _ in items)
 
-        # Extract data from Service 4
-        session_id = event.get('session_id')
-        github_data = event.get('github_data', {})
-        suggestions = event.get('suggestions', {})
-        
-        # Validate required fields
-        if not session_id:
-            raise ValueError("session_id is required")
+    return {'batchItemFailures': failures}
 
-        if not github_data:
-            raise ValueError("github_data is required")
-        
-        # Extract project details
-        project_name = github_data.get('projectName', 'Unknown')
-        owner = github_data.get('owner', 'unknown')
-        github_url = f"https://github.com/{owner}/{project_name}"
 
-        if not project_name or project_name == 'Unknown':
-            raise ValueError("projectName is required in github_data")
+def decode_sqs_record(record):
+    """Decode a queued Service 4 payload according to its content-type attribute"""
+    content_type = record.get('messageAttributes', {}).get('content-type', {}).get('stringValue')
 
-        print(f"[Service 5] Session: {session_id}")
-        print(f"[Service 5] Project: {project_name}")
+    if content_type == 'application/msgpack':
+        if msgpack is None:
+            raise RuntimeError("msgpack is required to decode queued sessions")
+        return msgpack.unpackb(base64.b64decode(record['body']), raw=False)
 
-        # Create timestamps
-        now = datetime.utcnow()
-        created_at = now.isoformat() + 'Z'
-        updated_at = created_at
-        
-        # Set expiration (30 days from now)
-        expires_at = int((now + timedelta(days=30)).timestamp())
+    return json.loads(record['body'])
 
-        # Transform suggestions to match expected format
-        transformed_suggestions = []
-        videos = suggestions.get('videos', [])
-        
-        for idx, video in enumerate(videos, 1):
-            transformed_suggestions.append({
-                'id': video.get('video_type', 'feature_demo'),
-                'sequence_number': video.get('sequence_number', idx),
-                'title': video.get('title', ''),
-                'description': video.get('description', ''),
-                'duration': parse_duration_to_seconds(video.get('duration', '1 minute')),
-                'video_type': video.get('video_type', 'feature_demo'),
-                'what_to_record': video.get('what_to_record', []),
-                'narration_script': video.get('narration_script', ''),
-                'key_highlights': video.get('key_highlights', []),
-                'technical_setup': video.get('technical_setup', {}),
-                'expected_outcome': video.get('expected_outcome', ''),
-                'transition_to_next': video.get('transition_to_next', '')
-            })
 
-        # Create session item matching expected schema
-        session_item = {
-            'id': session_id,              # Primary identifier (using session_id as id)
-            'project_name': project_name,  # Partition key
-            #'session_id': session_id,      # Sort key (keeping both for compatibility)
-            'github_url': github_url,
-            'status': 'initialized',
-            'suggestions': transformed_suggestions,
-            #'uploaded_videos': {},         # Empty dict - videos uploaded later
-            'created_at': created_at,
-            #'updated_at': updated_at,
-            'expires_at': expires_at,
-            # Additional fields for reference
-            #'owner': owner,
-            #'github_data': github_data,
-            #'project_analysis': event.get('project_analysis', {}),
-            #'project_metadata': event.get('project_metadata', {})
+def build_session_item(event):
+    """Validate one Service 4 payload and transform it into a session item"""
+    # Extract data from Service 4
+    session_id = event.get('session_id')
+    github_data = event.get('github_data', {})
+    suggestions = event.get('suggestions', {})
+    
+    # Validate required fields
+    if not session_id:
+        raise ValueError("session_id is required")
+
+    if not github_data:
+        raise ValueError("github_data is required")
+    
+    # Extract project details
+    project_name = github_data.get('projectName', 'Unknown')
+    owner = github_data.get('owner', 'unknown')
+    github_url = f"https://github.com/{owner}/{project_name}"
+
+    if not project_name or project_name == 'Unknown':
+        raise ValueError("projectName is required in github_data")
+
+    print(f"[Service 5] Session: {session_id}")
+    print(f"[Service 5] Project: {project_name}")
+
+    # Create timestamps
+    now = datetime.now(timezone.utc)
+    created_at = now.isoformat().replace('+00:00', 'Z')
+    updated_at = created_at
+    
+    # Set expiration (30 days from now)
+    expires_at = int(now.timestamp()) + SESSION_TTL_SECONDS
+
+    # Transform suggestions to match expected format
+    videos = suggestions.get('videos', [])
+    parse_duration = parse_duration_to_seconds
+    
+    transformed_suggestions = [
+        {
+            'id': video.get('video_type', 'feature_demo'),
+            'sequence_number': video.get('sequence_number', idx),
+            'title': video.get('title', ''),
+            'description': video.get('description', ''),
+            'duration': parse_duration(video.get('duration', '1 minute')),
+            'video_type': video.get('video_type', 'feature_demo'),
+            'what_to_record': video.get('what_to_record', []),
+            'narration_script': video.get('narration_script', ''),
+            'key_highlights': video.get('key_highlights', []),
+            'technical_setup': video.get('technical_setup', {}),
+            'expected_outcome': video.get('expected_outcome', ''),
+            'transition_to_next': video.get('transition_to_next', '')
         }
+        for idx, video in enumerate(videos, 1)
+    ]
+
+    # Create session item matching expected schema
+    session_item = {
+        'id': session_id,              # Primary identifier (using session_id as id)
+        'project_name': project_name,  # Partition key
+        #'session_id': session_id,      # Sort key (keeping both for compatibility)
+        'github_url': github_url,
+        'status': 'initialized',
+        'suggestions': transformed_suggestions,
+        #'uploaded_videos': {},         # Empty dict - videos uploaded later
+        'created_at': created_at,
+        #'updated_at': updated_at,
+        'expires_at': expires_at,
+        # Additional fields for reference
+        #'owner': owner,
+        #'github_data': github_data,
+        #'project_analysis': event.get('project_analysis', {}),
+        #'project_metadata': event.get('project_metadata', {})
+    }
+
+    return session_item
+
+
+def store_session(event):
+    """Transform one Service 4 payload into a session item and store it"""
+    try:
+        print("[Service 5] Starting Session Manager")
+        print(f"[Service 5] Table: {SESSIONS_TABLE_NAME}")
+
+        session_item = build_session_item(event)
+        session_id = session_item['id']
+        project_name = session_item['project_name']
+        created_at = session_item['created_at']
 
         # Store in DynamoDB
         print(f"[Service 5] Storing session in DynamoDB...")
-        table = dynamodb.Table(SESSIONS_TABLE_NAME)
-        
-        response = table.put_item(Item=session_item)
+        response = sessions_table.put_item(Item=session_item)
         
         print(f"[Service 5] ✅ Session stored successfully")
         print(f"[Service 5] HTTPStatusCode: {response['ResponseMetadata']['HTTPStatusCode']}")
@@ -116,11 +197,16 @@ def lambda_handler(event, context):
         
     except Exception as e:
         print(f"[Service 5] ❌ Error: {str(e)}")
-        import traceback
         traceback.print_exc()
         raise
 
 
+# First number in a duration string, e.g. '1.5' in '1.5 minutes'
+DURATION_NUMBER_RE = re.compile(r'[\d.]+')
+
+# Checked in order, so '1 minute 30 seconds' is treated as minutes
+DURATION_UNITS = (('minute', 60), ('second', 1), ('hour', 3600))
+
 def parse_duration_to_seconds(duration_str):
     """
     Convert duration string to seconds
@@ -130,23 +216,19 @@ def parse_duration_to_seconds(duration_str):
         duration_str = duration_str.lower().strip()
         
         # Extract number
-        import re
-        numbers = re.findall(r'[\d.]+', duration_str)
+        match = DURATION_NUMBER_RE.search(duration_str)
         
-        if not numbers:
+        if not match:
             return 60  # Default 1 minute
         
-        value = float(numbers[0])
+        value = float(match.group())
         
-        # Convert to seconds
-        if 'minute' in duration_str:
-            return int(value * 60)
-        elif 'second' in duration_str:
-            return int(value)
-        elif 'hour' in duration_str:
-            return int(value * 3600)
-        else:
-            return int(value * 60)  # Default to minutes
+        # Convert to seconds (default to minutes)
+        multiplier = next(
+            (mult for unit, mult in DURATION_UNITS if unit in duration_str),
+            60
+        )
+        return int(value * multiplier)
             
     except Exception as e:
         print(f"[Service 5] ⚠️ Could not parse duration '{duration_str}': {e}")
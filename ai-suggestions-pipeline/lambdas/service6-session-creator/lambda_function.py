@@ -5,6 +5,8 @@ import uuid
 import requests
 import boto3
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../shared'))
 from constants import Status, GITHUB_REPO_ANALYSIS_API_URL, GITHUB_REPO_ANALYSIS_API_TIMEOUT
@@ -12,8 +14,40 @@ from response_utils import success_response, error_response
 
 lambda_client = boto3.client('lambda')
 
+# Shared HTTPS session so calls to the analysis API reuse keep-alive connections
+# across warm invocations. Only connection errors and fast 429/502/503
+# responses are retried. Read timeouts are not, since the POST may already be
+# running upstream, and a 504 already means a ~30s gateway timeout.
+http_session = requests.Session()
+http_session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=2,
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=[429, 502, 503],
+        allowed_methods=frozenset({'POST'})
+    )
+))
+
 def lambda_handler(event, context):
     """Service 6: Session Creator & Orchestrator"""
+    # Scheduled warm-up pings return before doing any work, fanning out to
+    # keep `concurrency` containers warm
+    if event.get('warmer') is True:
+        concurrency = event.get('concurrency', 1)
+        if concurrency > 1:
+            try:
+                lambda_client.invoke(
+                    FunctionName=context.function_name,
+                    InvocationType='Event',
+                    Payload=json.dumps({'warmer': True, 'concurrency': concurrency - 1})
+                )
+            except Exception as e:
+                print(f"[Service 6] ⚠️ Warmer fan-out failed (non-critical): {str(e)}")
+        return {'statusCode': 200, 'body': 'warmed'}
+
     try:
         print(f"[Service 6] Starting Orchestrator")
 
@@ -77,7 +111,7 @@ def call_github_analysis_api(repo_url):
         Analysis response from the API
     """
     try:
-        response = requests.post(
+        response = http_session.post(
             GITHUB_REPO_ANALYSIS_API_URL,
             json={'github_url' : repo_url},
             timeout=GITHUB_REPO_ANALYSIS_API_TIMEOUT
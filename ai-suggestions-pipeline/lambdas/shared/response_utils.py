@@ -1,6 +1,20 @@
 import json
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the standard library json module
+    orjson = None
+
+
+def _dumps(data: Any) -> str:
+    """Serialize a response body, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data)
+
+
 def success_response(data: Dict[str, Any], status_code: int = 200) -> Dict[str, Any]:
     """
     Create a successful API Gateway response
@@ -20,7 +34,7 @@ def success_response(data: Dict[str, Any], status_code: int = 200) -> Dict[str,
             'Access-Control-Allow-Headers': 'Content-Type',
             'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
         },
-        'body': json.dumps(data)
+        'body': _dumps(data)
     }
 
 
@@ -51,5 +65,5 @@ def error_response(message: str, status_code: int = 500, error_type: Optional[st
             'Access-Control-Allow-Headers': 'Content-Type',
             'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
         },
-        'body': json.dumps(error_data)
+        'body': _dumps(error_data)
     }
\ No newline at end of file
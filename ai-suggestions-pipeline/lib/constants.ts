@@ -15,6 +15,7 @@ export class Constants {
     static readonly DYNAMODB_TABLE_NAME = 'demo-builder-sessions'
     static readonly DYNAMODB_STATUS_INDEX = 'StatusIndex'
     static readonly DYNAMODB_REPO_INDEX = 'RepoUrlIndex'
+    static readonly DYNAMODB_SUGGESTIONS_CACHE_TABLE_NAME = 'ai-suggestions-cache'
 
     // =============================================================================================
     // Lambda Function Names
@@ -47,6 +48,7 @@ export class Constants {
     // =============================================================================================
     static readonly EXPORT_TABLE_NAME = 'DemoBuilderSessionsTableName'
     static readonly EXPORT_TABLE_ARN = 'DemoBuilderSessionsTableArn'
+    static readonly EXPORT_SUGGESTIONS_CACHE_TABLE_NAME = 'DemoBuilderSuggestionsCacheTableName'
 
     // =============================================================================================
     // Lambda Configurations
@@ -5,6 +5,7 @@ import { Constants } from './constants'
 
 export class StorageCreationStack extends cdk.Stack {
     public readonly sessionTable: dynamodb.Table
+    public readonly suggestionsCacheTable: dynamodb.Table
 
     constructor(scope: Construct, id: string, props?: cdk.StackProps) {
         super(scope, id, props)
@@ -52,6 +53,23 @@ export class StorageCreationStack extends cdk.Stack {
         }
     })
 
+    // =============================================================================================
+    // DynamoDB AI Suggestions Cache Table (Gemini responses keyed by prompt hash)
+    // =============================================================================================
+    this.suggestionsCacheTable = new dynamodb.Table(this, 'SuggestionsCacheTable', {
+        tableName: Constants.DYNAMODB_SUGGESTIONS_CACHE_TABLE_NAME,
+
+        partitionKey: {
+            name: 'prompt_hash',
+            type: dynamodb.AttributeType.STRING
+        },
+
+        billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+        removalPolicy: cdk.RemovalPolicy.DESTROY,
+        timeToLiveAttribute: 'expires_at',
+        encryption: dynamodb.TableEncryption.AWS_MANAGED
+    })
+
     // =============================================================================================
     // Exports to be used by other stacks
     // =============================================================================================
@@ -66,5 +84,11 @@ export class StorageCreationStack extends cdk.Stack {
         exportName: Constants.EXPORT_TABLE_ARN,
         description: 'DynamoDB Sessions Table Arn'
     })
+
+    new cdk.CfnOutput(this, 'SuggestionsCacheTableName', {
+        value: this.suggestionsCacheTable.tableName,
+        exportName: Constants.EXPORT_SUGGESTIONS_CACHE_TABLE_NAME,
+        description: 'DynamoDB AI Suggestions Cache Table Name'
+    })
     }
 }
\ No newline at end of file
@@ -6,10 +6,16 @@ Fetches GitHub repository information and README content
 import json
 import os
 import re
+import time
+import threading
 import requests
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Optional, Tuple
 
 # Fix SSL certificate path for Lambda environment
+CA_BUNDLE = None
 try:
     import certifi
     # Set certificate bundle path for requests
@@ -17,18 +23,95 @@ try:
     if os.path.exists(cert_path):
         os.environ['REQUESTS_CA_BUNDLE'] = cert_path
         os.environ['SSL_CERT_FILE'] = cert_path
+        CA_BUNDLE = cert_path
 except (ImportError, Exception) as e:
     # Fallback: use system certificates or disable verification (not recommended for production)
     pass
 
 try:
     import boto3
+    from botocore.config import Config
     from botocore.exceptions import ClientError
 except ImportError:
     # boto3 may not be available in local testing
     boto3 = None
+    Config = None
     ClientError = Exception
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the standard library json module
+    orjson = None
+
+# Shared HTTP session so GitHub calls reuse pooled connections across warm invocations
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+# Resolve the CA bundle once at cold start rather than on every request
+if CA_BUNDLE:
+    SESSION.verify = CA_BUNDLE
+
+# Recent GitHub responses keyed by (owner, repo), reused by warm containers
+GITHUB_CACHE_TTL = int(os.environ.get('GITHUB_CACHE_TTL', '300'))
+GITHUB_CACHE_MAX_ENTRIES = 16
+# READMEs can be megabytes, so the cache is also capped by total README size
+GITHUB_CACHE_MAX_BYTES = 8 * 1024 * 1024
+GITHUB_CACHE: 'OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any], str, int]]' = OrderedDict()
+_github_cache_bytes = 0
+
+# Last ETag and body per GitHub URL, used to revalidate with If-None-Match once
+# GITHUB_CACHE entries go stale (304s don't count against the rate limit)
+GITHUB_ETAG_MAX_ENTRIES = 64
+GITHUB_ETAG_MAX_BYTES = 8 * 1024 * 1024
+GITHUB_ETAGS: 'OrderedDict[str, Tuple[str, bytes]]' = OrderedDict()
+_github_etags_bytes = 0
+# Repo info and README are fetched on parallel threads
+GITHUB_ETAGS_LOCK = threading.Lock()
+
+# Service 4 cache (DynamoDB) holding full results shared across containers
+CACHE_SERVICE_FUNCTION = 'service-4-cache-service'
+
+# Async ('Event') invokes accept far smaller payloads than the 6 MB synchronous
+# limit; larger payloads are sent synchronously instead of being rejected
+ASYNC_INVOKE_MAX_BYTES = 256 * 1024
+
+# Lambda clients per region, created on first use and reused across warm invocations
+_lambda_clients: Dict[str, Any] = {}
+
+
+def json_dumps(data: Any) -> str:
+    """
+    Serialize data to a JSON string, using orjson when available
+    
+    Args:
+        data: JSON-serializable value
+        
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data)
+
+
+def json_loads(data: Any) -> Any:
+    """
+    Parse a JSON string or bytes, using orjson when available
+    
+    Args:
+        data: JSON document as str or bytes
+        
+    Returns:
+        Parsed value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Handles github.com/owner/repo with optional .git suffix, path, query or fragment
+OWNER_REPO_RE = re.compile(r'github\.com/([^/]+)/([^/?#]+?)(?:\.git)?(?:[/?#]|$)')
+
 
 def extract_owner_repo(github_url: str) -> Optional[Dict[str, str]]:
     """
@@ -40,23 +123,74 @@ def extract_owner_repo(github_url: str) -> Optional[Dict[str, str]]:
     Returns:
         Dict with 'owner' and 'repo' keys, or None if invalid
     """
-    # Handle various GitHub URL formats
-    patterns = [
-        r'github\.com/([^/]+)/([^/?#]+)',
-        r'github\.com/([^/]+)/([^/?#]+)\.git',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, github_url)
-        if match:
-            return {
-                'owner': match.group(1),
-                'repo': match.group(2).replace('.git', '')
-            }
+    match = OWNER_REPO_RE.search(github_url)
+    if match:
+        return {
+            'owner': match.group(1),
+            'repo': match.group(2)
+        }
     
     return None
 
 
+def result_cache_key(owner_repo: Dict[str, str]) -> str:
+    """
+    Build the shared cache key for a full result
+    
+    GitHub owner and repo names are case-insensitive, so the key is
+    lowercased to make every spelling of a URL share one entry
+    
+    Args:
+        owner_repo: Dict with 'owner' and 'repo' keys from extract_owner_repo
+        
+    Returns:
+        Cache key for Service 4
+    """
+    return f"github_{owner_repo['owner'].lower()}_{owner_repo['repo'].lower()}"
+
+
+def github_get(url: str, headers: Dict[str, str]) -> Tuple[int, bytes]:
+    """
+    GET a GitHub API URL, revalidating a previously seen response by ETag
+    
+    Args:
+        url: GitHub API URL
+        headers: Request headers
+        
+    Returns:
+        Tuple of (status code, response body); a 304 is returned as 200 with the stored body
+    """
+    global _github_etags_bytes
+    
+    with GITHUB_ETAGS_LOCK:
+        stored = GITHUB_ETAGS.get(url)
+    if stored:
+        headers = {**headers, 'If-None-Match': stored[0]}
+    
+    response = SESSION.get(url, headers=headers, timeout=30)
+    
+    if response.status_code == 304 and stored:
+        with GITHUB_ETAGS_LOCK:
+            if url in GITHUB_ETAGS:
+                GITHUB_ETAGS.move_to_end(url)
+        print(f"[Service1] GitHub content not modified: {url}")
+        return 200, stored[1]
+    
+    etag = response.headers.get('ETag')
+    if response.status_code == 200 and etag and len(response.content) <= GITHUB_ETAG_MAX_BYTES:
+        with GITHUB_ETAGS_LOCK:
+            previous = GITHUB_ETAGS.pop(url, None)
+            if previous:
+                _github_etags_bytes -= len(previous[1])
+            GITHUB_ETAGS[url] = (etag, response.content)
+            _github_etags_bytes += len(response.content)
+            while len(GITHUB_ETAGS) > GITHUB_ETAG_MAX_ENTRIES or _github_etags_bytes > GITHUB_ETAG_MAX_BYTES:
+                _, (_, body) = GITHUB_ETAGS.popitem(last=False)
+                _github_etags_bytes -= len(body)
+    
+    return response.status_code, response.content
+
+
 def fetch_repository_info(owner: str, repo: str, token: str = None) -> Dict[str, Any]:
     """
     Fetch repository information from GitHub API
@@ -81,25 +215,18 @@ def fetch_repository_info(owner: str, repo: str, token: str = None) -> Dict[str,
         headers['Authorization'] = f'token {token}'
     
     print(f"[Service1] Fetching repository info: {owner}/{repo}")
-    # Use system certificates or certifi if available
-    verify_ssl = True
-    try:
-        import certifi
-        verify_ssl = certifi.where()
-    except ImportError:
-        pass
-    response = requests.get(url, headers=headers, verify=verify_ssl, timeout=30)
+    status_code, content = github_get(url, headers)
     
-    if response.status_code == 404:
+    if status_code == 404:
         raise Exception("Repository not found")
-    elif response.status_code == 403:
+    elif status_code == 403:
         raise Exception("Rate limit exceeded or access forbidden")
-    elif response.status_code == 401:
+    elif status_code == 401:
         raise Exception("Invalid or missing GitHub token")
-    elif response.status_code != 200:
-        raise Exception(f"GitHub API error: {response.status_code}")
+    elif status_code != 200:
+        raise Exception(f"GitHub API error: {status_code}")
     
-    return response.json()
+    return json_loads(content)
 
 
 def fetch_readme(owner: str, repo: str, token: str = None) -> str:
@@ -126,27 +253,66 @@ def fetch_readme(owner: str, repo: str, token: str = None) -> str:
         headers['Authorization'] = f'token {token}'
     
     print(f"[Service1] Fetching README: {owner}/{repo}")
-    # Use system certificates or certifi if available
-    verify_ssl = True
-    try:
-        import certifi
-        verify_ssl = certifi.where()
-    except ImportError:
-        pass
-    response = requests.get(url, headers=headers, verify=verify_ssl, timeout=30)
+    status_code, content = github_get(url, headers)
     
-    if response.status_code == 404:
+    if status_code == 404:
         # README not found is not critical, return empty string
         print(f"[Service1] README not found for {owner}/{repo}")
         return ""
-    elif response.status_code != 200:
-        print(f"[Service1] Warning: Could not fetch README ({response.status_code})")
+    elif status_code != 200:
+        print(f"[Service1] Warning: Could not fetch README ({status_code})")
         return ""
     
-    return response.text
+    # GitHub serves raw README content as UTF-8
+    return content.decode('utf-8', errors='replace')
+
+
+def fetch_github_data(owner: str, repo: str, token: str = None) -> Tuple[Dict[str, Any], str]:
+    """
+    Fetch repository information and README, reusing recent results
+    already fetched by this Lambda container
+    
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        token: GitHub personal access token (optional)
+        
+    Returns:
+        Tuple of (repository information dict, README content)
+    """
+    global _github_cache_bytes
+    
+    cache_key = (owner.lower(), repo.lower())
+    cached = GITHUB_CACHE.get(cache_key)
+    if cached and time.monotonic() - cached[0] < GITHUB_CACHE_TTL:
+        GITHUB_CACHE.move_to_end(cache_key)
+        print(f"[Service1] ✅ Reusing in-memory GitHub data for {owner}/{repo}")
+        return cached[1], cached[2]
+    
+    # lambda_handler already missed on the full result in the shared Service 4
+    # cache, so go straight to GitHub. Repository info and README are
+    # independent calls, so overlap them
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        repo_info_future = executor.submit(fetch_repository_info, owner, repo, token)
+        readme_future = executor.submit(fetch_readme, owner, repo, token)
+        repo_info = repo_info_future.result()
+        readme_content = readme_future.result()
+    
+    readme_bytes = len(readme_content.encode('utf-8'))
+    if readme_bytes <= GITHUB_CACHE_MAX_BYTES:
+        previous = GITHUB_CACHE.pop(cache_key, None)
+        if previous:
+            _github_cache_bytes -= previous[3]
+        GITHUB_CACHE[cache_key] = (time.monotonic(), repo_info, readme_content, readme_bytes)
+        _github_cache_bytes += readme_bytes
+        while len(GITHUB_CACHE) > GITHUB_CACHE_MAX_ENTRIES or _github_cache_bytes > GITHUB_CACHE_MAX_BYTES:
+            _, evicted = GITHUB_CACHE.popitem(last=False)
+            _github_cache_bytes -= evicted[3]
+    
+    return repo_info, readme_content
 
 
-def process_request(event: Dict[str, Any]) -> Dict[str, Any]:
+def process_request(event: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
     """
     Process the Lambda event and fetch GitHub repository data
     
@@ -154,12 +320,12 @@ def process_request(event: Dict[str, Any]) -> Dict[str, Any]:
         event: Lambda event containing github_url (direct invoke) or body (API Gateway)
         
     Returns:
-        Processed repository data
+        Tuple of (repository metadata without the README, README content)
     """
     # Handle API Gateway event format (body is JSON string)
     if 'body' in event and isinstance(event.get('body'), str):
         try:
-            body_data = json.loads(event['body'])
+            body_data = json_loads(event['body'])
             github_url = body_data.get('github_url')
         except (json.JSONDecodeError, TypeError):
             github_url = None
@@ -181,28 +347,50 @@ def process_request(event: Dict[str, Any]) -> Dict[str, Any]:
     # Get GitHub token from environment
     github_token = os.environ.get('GITHUB_TOKEN', '')
     
-    # Fetch repository information
-    repo_info = fetch_repository_info(owner, repo, github_token if github_token else None)
+    # Fetch repository information and README content
+    repo_info, readme_content = fetch_github_data(owner, repo, github_token if github_token else None)
     
-    # Fetch README content
-    readme_content = fetch_readme(owner, repo, github_token if github_token else None)
-    
-    # Build response
+    # Build response; the README is kept separate so Service 3 never receives it
     result = {
         "projectName": repo_info.get('name', repo),
         "owner": repo_info.get('owner', {}).get('login', owner),
         "stars": repo_info.get('stargazers_count', 0),
         "language": repo_info.get('language', ''),
         "topics": repo_info.get('topics', []),
-        "description": repo_info.get('description', ''),
-        "readme": readme_content
+        "description": repo_info.get('description', '')
     }
     
     print(f"[Service1] ✅ Successfully fetched data for {owner}/{repo}")
-    return result
+    return result, readme_content
+
+
+def get_lambda_client(region: str):
+    """
+    Get a Lambda client for the region, creating it on first use
+    
+    Args:
+        region: AWS region
+        
+    Returns:
+        boto3 Lambda client
+    """
+    client = _lambda_clients.get(region)
+    if client is None:
+        client = boto3.client(
+            'lambda',
+            region_name=region,
+            config=Config(
+                max_pool_connections=10,
+                retries={'total_max_attempts': 3, 'mode': 'adaptive'},
+                tcp_keepalive=True
+            )
+        )
+        _lambda_clients[region] = client
+    return client
 
 
-def invoke_lambda_service(function_name: str, payload: Dict[str, Any], region: str = 'us-west-1') -> Dict[str, Any]:
+def invoke_lambda_service(function_name: str, payload: Dict[str, Any], region: str = 'us-west-1',
+                          invocation_type: str = 'RequestResponse') -> Dict[str, Any]:
     """
     Invoke another Lambda function
     
@@ -210,9 +398,12 @@ def invoke_lambda_service(function_name: str, payload: Dict[str, Any], region: s
         function_name: Name of the Lambda function to invoke
         payload: Payload to send to the function
         region: AWS region
+        invocation_type: 'RequestResponse' to wait for the result, or 'Event'
+            to queue the call and return immediately (falls back to
+            'RequestResponse' when the payload is over ASYNC_INVOKE_MAX_BYTES)
         
     Returns:
-        Response from the Lambda function
+        Response from the Lambda function (empty for 'Event' invocations)
         
     Raises:
         Exception: If invocation fails
@@ -221,16 +412,26 @@ def invoke_lambda_service(function_name: str, payload: Dict[str, Any], region: s
         raise ImportError("boto3 is required for Lambda-to-Lambda invocation")
     
     try:
-        lambda_client = boto3.client('lambda', region_name=region)
+        lambda_client = get_lambda_client(region)
         print(f"[Service1] Invoking {function_name}...")
         
+        body = json_dumps(payload).encode('utf-8')
+        if invocation_type == 'Event' and len(body) > ASYNC_INVOKE_MAX_BYTES:
+            print(f"[Service1] Payload for {function_name} is {len(body)} bytes, too large to queue; invoking synchronously")
+            invocation_type = 'RequestResponse'
+        
         response = lambda_client.invoke(
             FunctionName=function_name,
-            InvocationType='RequestResponse',
-            Payload=json.dumps(payload)
+            InvocationType=invocation_type,
+            Payload=body
         )
         
-        result = json.loads(response['Payload'].read())
+        if invocation_type == 'Event':
+            # Async invocations return 202 with no payload to parse
+            print(f"[Service1] ✅ {function_name} queued asynchronously")
+            return {}
+        
+        result = json_loads(response['Payload'].read())
         
         if result.get('statusCode') != 200:
             error_msg = result.get('body', {}).get('error', 'Unknown error')
@@ -262,17 +463,14 @@ def call_service3_analyze_project(github_data: Dict[str, Any], parsed_readme: Di
     Call Service 3 to analyze project
     
     Args:
-        github_data: GitHub repository data (from Service 1)
+        github_data: GitHub repository data without the README (from Service 1)
         parsed_readme: Parsed README data (from Service 2)
         
     Returns:
         Project analysis from Service 3
     """
-    # Remove readme from github_data before sending to Service 3
-    github_data_for_service3 = {k: v for k, v in github_data.items() if k != 'readme'}
-    
     payload = {
-        "github_data": github_data_for_service3,
+        "github_data": github_data,
         "parsed_readme": parsed_readme
     }
     return invoke_lambda_service('service-3-project-analyzer', payload)
@@ -293,7 +491,7 @@ def call_service4_get_cache(key: str) -> Optional[Dict[str, Any]]:
             "operation": "get",
             "key": key
         }
-        result = invoke_lambda_service('service-4-cache-service', payload)
+        result = invoke_lambda_service(CACHE_SERVICE_FUNCTION, payload)
         
         if result.get('found'):
             print(f"[Service1] ✅ Cache hit for key: {key}")
@@ -308,7 +506,7 @@ def call_service4_get_cache(key: str) -> Optional[Dict[str, Any]]:
 
 def call_service4_cache_result(key: str, value: Dict[str, Any], ttl: int = 3600) -> bool:
     """
-    Call Service 4 to cache result (optional)
+    Call Service 4 to cache result (optional, fire-and-forget)
     
     Args:
         key: Cache key
@@ -316,7 +514,7 @@ def call_service4_cache_result(key: str, value: Dict[str, Any], ttl: int = 3600)
         ttl: Time to live in seconds
         
     Returns:
-        True if successful
+        True if the write was queued or completed
     """
     try:
         payload = {
@@ -325,13 +523,45 @@ def call_service4_cache_result(key: str, value: Dict[str, Any], ttl: int = 3600)
             "value": value,
             "ttl": ttl
         }
-        invoke_lambda_service('service4-cache-service', payload)
+        # Nothing waits on the write, so don't bill this request for it
+        invoke_lambda_service(CACHE_SERVICE_FUNCTION, payload, invocation_type='Event')
         return True
     except Exception as e:
         print(f"[Service1] ⚠️  Cache failed (non-critical): {str(e)}")
         return False
 
 
+# Headers for API Gateway responses, shared rather than rebuilt per response
+APIGW_HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "*"
+}
+
+
+def respond(status_code: int, body: Any, is_api_gateway: bool) -> Dict[str, Any]:
+    """
+    Build a Lambda response in the shape the caller expects
+    
+    Args:
+        status_code: HTTP status code
+        body: Response payload
+        is_api_gateway: True for API Gateway (AWS_PROXY) events, which need a JSON string body
+        
+    Returns:
+        Standard Lambda response with statusCode and body
+    """
+    if is_api_gateway:
+        return {
+            "statusCode": status_code,
+            "headers": APIGW_HEADERS,
+            "body": json_dumps(body)
+        }
+    return {
+        "statusCode": status_code,
+        "body": body
+    }
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     AWS Lambda handler function
@@ -348,6 +578,25 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         For API Gateway (AWS_PROXY): body must be JSON string
         For direct invoke: body can be object
     """
+    # Scheduled warm-up pings return before doing any work, fanning out to
+    # keep `concurrency` containers warm
+    if event.get('warmer') is True:
+        concurrency = event.get('concurrency', 1)
+        if concurrency > 1:
+            try:
+                invoke_lambda_service(
+                    context.function_name,
+                    {'warmer': True, 'concurrency': concurrency - 1},
+                    region=os.environ.get('AWS_REGION', 'us-west-1'),
+                    invocation_type='Event'
+                )
+            except Exception as e:
+                print(f"[Service1] ⚠️  Warmer fan-out failed (non-critical): {str(e)}")
+        return {"statusCode": 200, "body": "warmed"}
+    
+    # API Gateway (AWS_PROXY) needs a JSON string body; direct invokes get the object
+    is_api_gateway = 'requestContext' in event or ('body' in event and isinstance(event.get('body'), str))
+    
     try:
         print(f"[Service1] Starting GitHub fetch service")
         
@@ -355,7 +604,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         github_url = None
         if 'body' in event and isinstance(event.get('body'), str):
             try:
-                body_data = json.loads(event['body'])
+                body_data = json_loads(event['body'])
                 github_url = body_data.get('github_url')
             except (json.JSONDecodeError, TypeError):
                 github_url = None
@@ -363,43 +612,32 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             github_url = event.get('github_url')
         
         # Check cache if we have a github_url
+        cache_key = None
         if github_url:
             owner_repo = extract_owner_repo(github_url)
             if owner_repo:
-                cache_key = f"github_{owner_repo['owner']}_{owner_repo['repo']}"
+                cache_key = result_cache_key(owner_repo)
                 cached_result = call_service4_get_cache(cache_key)
                 
                 if cached_result:
                     # Cache hit - return cached result immediately
                     print(f"[Service1] ✅ Returning cached result for {github_url}")
-                    is_api_gateway = 'requestContext' in event or ('body' in event and isinstance(event.get('body'), str))
-                    
-                    if is_api_gateway:
-                        return {
-                            "statusCode": 200,
-                            "headers": {
-                                "Content-Type": "application/json",
-                                "Access-Control-Allow-Origin": "*"
-                            },
-                            "body": json.dumps(cached_result)
-                        }
-                    else:
-                        return {
-                            "statusCode": 200,
-                            "body": cached_result
-                        }
+                    return respond(200, cached_result, is_api_gateway)
         
         # Step 1: Fetch GitHub data (cache miss - proceed with computation)
-        github_data = process_request(event)
+        github_data, readme_content = process_request(event)
         
         # Step 2: Call Service 2 to parse README
         print(f"[Service1] Calling Service 2 to parse README...")
-        parsed_readme = call_service2_parse_readme(github_data.get('readme', ''))
+        parsed_readme = call_service2_parse_readme(readme_content)
         
         # Step 3: Call Service 3 to analyze project
         print(f"[Service1] Calling Service 3 to analyze project...")
         project_analysis = call_service3_analyze_project(github_data, parsed_readme)
         
+        # Callers downstream (AI suggestions) still read the README from github_data
+        github_data["readme"] = readme_content
+        
         # Combine all results
         result = {
             "github_data": github_data,
@@ -407,49 +645,17 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             "project_analysis": project_analysis
         }
         
-        # Step 4: Cache the complete result in DynamoDB (non-blocking)
-        cache_key = f"github_{github_data.get('owner', '')}_{github_data.get('projectName', '')}"
-        call_service4_cache_result(cache_key, result)
-        
-        # Check if this is an API Gateway request (AWS_PROXY integration)
-        # API Gateway expects body as JSON string
-        is_api_gateway = 'requestContext' in event or ('body' in event and isinstance(event.get('body'), str))
-        
-        if is_api_gateway:
-            return {
-                "statusCode": 200,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*"
-                },
-                "body": json.dumps(result)
-            }
-        else:
-            # Direct Lambda invoke - return object
-            return {
-                "statusCode": 200,
-                "body": result
-            }
+        # Step 4: Cache the complete result in DynamoDB (non-blocking), under
+        # the same key the lookup above used
+        if cache_key:
+            call_service4_cache_result(cache_key, result)
+        
+        return respond(200, result, is_api_gateway)
         
     except ValueError as e:
         print(f"[Service1] ❌ Validation Error: {str(e)}")
         error_response = {"error": str(e)}
-        is_api_gateway = 'requestContext' in event or ('body' in event and isinstance(event.get('body'), str))
-        
-        if is_api_gateway:
-            return {
-                "statusCode": 400,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*"
-                },
-                "body": json.dumps(error_response)
-            }
-        else:
-            return {
-                "statusCode": 400,
-                "body": error_response
-            }
+        return respond(400, error_response, is_api_gateway)
         
     except Exception as e:
         print(f"[Service1] ❌ Error: {str(e)}")
@@ -466,20 +672,5 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             status_code = 500
         
         error_response = {"error": error_message}
-        is_api_gateway = 'requestContext' in event or ('body' in event and isinstance(event.get('body'), str))
-        
-        if is_api_gateway:
-            return {
-                "statusCode": status_code,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*"
-                },
-                "body": json.dumps(error_response)
-            }
-        else:
-            return {
-                "statusCode": status_code,
-                "body": error_response
-            }
+        return respond(status_code, error_response, is_api_gateway)
 
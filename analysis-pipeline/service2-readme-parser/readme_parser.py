@@ -7,6 +7,61 @@ import json
 import re
 from typing import Dict, Any, List, Optional
 
+# Pre-compiled patterns, built once per container instead of on every parse
+TITLE_PATTERNS = [
+    re.compile(r'^#\s+(.+)$'),  # # Title
+    re.compile(r'^(.+)\n={3,}$'),  # Title\n===
+]
+UNDERLINE_RE = re.compile(r'^={3,}$')
+MARKDOWN_LINK_RE = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+HTML_ENTITY_RE = re.compile(r'&[^;]+;')
+BADGE_RE = re.compile(r'!\[.*?\]\(.*?\)')
+WHITESPACE_RE = re.compile(r'\s+')
+
+FEATURE_SECTION_PATTERNS = [
+    re.compile(r'(?:^##\s+Features?\s*$\n)(?:.*\n)*?((?:[-*+]|\d+\.)\s+.+?)(?=\n##|\Z)',
+               re.MULTILINE | re.DOTALL | re.IGNORECASE),
+    re.compile(r'(?:^###\s+Features?\s*$\n)(?:.*\n)*?((?:[-*+]|\d+\.)\s+.+?)(?=\n##|\Z)',
+               re.MULTILINE | re.DOTALL | re.IGNORECASE),
+]
+LIST_ITEM_RE = re.compile(r'[-*+]\s+(.+?)(?=\n[-*+]|\n\n|\Z)')
+BOLD_FEATURE_RE = re.compile(r'^\*\s+\*\*([^:]+):\*\*', re.MULTILINE)
+BULLET_RE = re.compile(r'[-*+]\s+(.+)')
+STAR_BULLET_RE = re.compile(r'^\*\s+(.+)$')
+BOLD_TEXT_RE = re.compile(r'\*\*([^*]+)\*\*')
+
+INSTALLATION_PATTERNS = [
+    re.compile(r'(?:^##\s+Install(?:ation)?\s*$\n)(.*?)(?=\n##|\Z)',
+               re.MULTILINE | re.DOTALL | re.IGNORECASE),
+    re.compile(r'(?:^###\s+Install(?:ation)?\s*$\n)(.*?)(?=\n##|\Z)',
+               re.MULTILINE | re.DOTALL | re.IGNORECASE),
+]
+USAGE_PATTERNS = [
+    re.compile(r'(?:^##\s+Usage\s*$\n)(.*?)(?=\n##|\Z)',
+               re.MULTILINE | re.DOTALL | re.IGNORECASE),
+    re.compile(r'(?:^###\s+Usage\s*$\n)(.*?)(?=\n##|\Z)',
+               re.MULTILINE | re.DOTALL | re.IGNORECASE),
+]
+
+HEADING_RE = re.compile(r'^#+\s+', re.MULTILINE)
+LINK_RE = re.compile(r'\[.+\]\(.+\)')
+
+
+def clean_title(title: str) -> str:
+    """
+    Strip markdown links, HTML entities and badges from a title
+    
+    Args:
+        title: Raw title text
+        
+    Returns:
+        Cleaned title string
+    """
+    title = MARKDOWN_LINK_RE.sub(r'\1', title)  # [text](url) -> text
+    title = HTML_ENTITY_RE.sub('', title)  # Remove &middot; etc
+    title = BADGE_RE.sub('', title)  # Remove badges
+    return WHITESPACE_RE.sub(' ', title).strip()  # Clean whitespace
+
 
 def extract_title(readme: str) -> str:
     """
@@ -19,34 +74,17 @@ def extract_title(readme: str) -> str:
         Title string, or empty string if not found
     """
     # Match first H1 heading (# Title or Title with ===)
-    patterns = [
-        r'^#\s+(.+)$',  # # Title
-        r'^(.+)\n={3,}$',  # Title\n===
-    ]
-    
-    lines = readme.split('\n')
+    # Only the first 11 lines are inspected, so don't split the whole README
+    lines = readme.split('\n', 11)
     for i, line in enumerate(lines[:10]):  # Check first 10 lines
-        for pattern in patterns:
-            match = re.match(pattern, line.strip())
+        for pattern in TITLE_PATTERNS:
+            match = pattern.match(line.strip())
             if match:
-                title = match.group(1).strip()
-                # Clean up: remove markdown links [text](url) -> text
-                title = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', title)
-                # Remove HTML entities and badges
-                title = re.sub(r'&[^;]+;', '', title)  # Remove &middot; etc
-                title = re.sub(r'!\[.*?\]\(.*?\)', '', title)  # Remove badges
-                title = re.sub(r'\s+', ' ', title).strip()  # Clean whitespace
-                return title
+                return clean_title(match.group(1).strip())
             # Check for underline style
             if i < len(lines) - 1:
-                if re.match(r'^={3,}$', lines[i+1].strip()):
-                    title = line.strip()
-                    # Clean up title
-                    title = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', title)
-                    title = re.sub(r'&[^;]+;', '', title)
-                    title = re.sub(r'!\[.*?\]\(.*?\)', '', title)
-                    title = re.sub(r'\s+', ' ', title).strip()
-                    return title
+                if UNDERLINE_RE.match(lines[i+1].strip()):
+                    return clean_title(line.strip())
     
     return ""
 
@@ -64,23 +102,17 @@ def extract_features(readme: str) -> List[str]:
     features = []
     
     # Look for Features section
-    patterns = [
-        r'(?:^##\s+Features?\s*$\n)(?:.*\n)*?((?:[-*+]|\d+\.)\s+.+?)(?=\n##|\Z)',
-        r'(?:^###\s+Features?\s*$\n)(?:.*\n)*?((?:[-*+]|\d+\.)\s+.+?)(?=\n##|\Z)',
-    ]
-    
-    for pattern in patterns:
-        matches = re.finditer(pattern, readme, re.MULTILINE | re.DOTALL | re.IGNORECASE)
-        for match in matches:
+    for pattern in FEATURE_SECTION_PATTERNS:
+        for match in pattern.finditer(readme):
             content = match.group(1)
             # Extract list items
-            items = re.findall(r'[-*+]\s+(.+?)(?=\n[-*+]|\n\n|\Z)', content)
+            items = LIST_ITEM_RE.findall(content)
             features.extend([item.strip() for item in items if item.strip()])
     
     # Fallback 1: Find bullet points with bold format like "* **Feature:** description"
     if not features:
         # Look for patterns like "* **Declarative:** ..." or "* **Component-Based:** ..."
-        bold_features = re.findall(r'^\*\s+\*\*([^:]+):\*\*', readme, re.MULTILINE)
+        bold_features = BOLD_FEATURE_RE.findall(readme)
         if bold_features:
             features.extend([f.strip() for f in bold_features if f.strip()])
     
@@ -95,31 +127,31 @@ def extract_features(readme: str) -> List[str]:
             if in_features_section:
                 if line.strip().startswith(('#', '##')):
                     break
-                match = re.match(r'[-*+]\s+(.+)', line)
+                match = BULLET_RE.match(line)
                 if match:
                     features.append(match.group(1).strip())
     
     # Fallback 3: If still no features, look for bullet points in first 50 lines
     # (common pattern: features listed right after title)
     if not features:
-        lines = readme.split('\n')[:50]
+        lines = readme.split('\n', 50)[:50]
         for line in lines:
             # Match "* **Feature:**" or "* Feature" patterns
-            match = re.match(r'^\*\s+\*\*([^:]+):\*\*', line)
+            match = BOLD_FEATURE_RE.match(line)
             if match:
                 feature = match.group(1).strip()
                 if len(feature) > 2 and len(feature) < 50:
                     features.append(feature)
             else:
                 # Match simple "* Feature" if it's a short line (likely a feature)
-                match = re.match(r'^\*\s+(.+)$', line)
+                match = STAR_BULLET_RE.match(line)
                 if match:
                     text = match.group(1).strip()
                     # Only add if it looks like a feature (not too long, no links)
                     if len(text) < 100 and not text.startswith('http'):
                         # Clean up markdown
-                        text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
-                        text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
+                        text = MARKDOWN_LINK_RE.sub(r'\1', text)
+                        text = BOLD_TEXT_RE.sub(r'\1', text)
                         if text and len(text) > 3:
                             features.append(text)
     
@@ -137,17 +169,12 @@ def extract_installation(readme: str) -> str:
         Installation instructions as string
     """
     # Look for Installation/Install section
-    patterns = [
-        r'(?:^##\s+Install(?:ation)?\s*$\n)(.*?)(?=\n##|\Z)',
-        r'(?:^###\s+Install(?:ation)?\s*$\n)(.*?)(?=\n##|\Z)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, readme, re.MULTILINE | re.DOTALL | re.IGNORECASE)
+    for pattern in INSTALLATION_PATTERNS:
+        match = pattern.search(readme)
         if match:
             content = match.group(1).strip()
             # Take first few lines (usually code blocks or commands)
-            lines = content.split('\n')[:10]
+            lines = content.split('\n', 10)[:10]
             return '\n'.join(lines).strip()
     
     return ""
@@ -164,17 +191,12 @@ def extract_usage(readme: str) -> str:
         Usage instructions as string
     """
     # Look for Usage section
-    patterns = [
-        r'(?:^##\s+Usage\s*$\n)(.*?)(?=\n##|\Z)',
-        r'(?:^###\s+Usage\s*$\n)(.*?)(?=\n##|\Z)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, readme, re.MULTILINE | re.DOTALL | re.IGNORECASE)
+    for pattern in USAGE_PATTERNS:
+        match = pattern.search(readme)
         if match:
             content = match.group(1).strip()
             # Take first 15 lines
-            lines = content.split('\n')[:15]
+            lines = content.split('\n', 15)[:15]
             return '\n'.join(lines).strip()
     
     return ""
@@ -194,13 +216,13 @@ def check_documentation(readme: str) -> bool:
         return False
     
     # Check for multiple sections (headings)
-    heading_count = len(re.findall(r'^#+\s+', readme, re.MULTILINE))
+    heading_count = len(HEADING_RE.findall(readme))
     
     # Check for code blocks
-    code_blocks = len(re.findall(r'```', readme))
+    code_blocks = readme.count('```')
     
     # Check for links
-    links = len(re.findall(r'\[.+\]\(.+\)', readme))
+    links = len(LINK_RE.findall(readme))
     
     # Consider it documented if it has multiple sections or code examples
     return heading_count >= 3 or code_blocks >= 2 or links >= 3
@@ -225,11 +247,15 @@ def parse_readme(readme: str) -> Dict[str, Any]:
             "hasDocumentation": False
         }
     
+    # Installation and usage are only found under "##"/"###" headings, so
+    # skip both full-document scans for READMEs without any
+    has_sections = '##' in readme
+    
     result = {
         "title": extract_title(readme),
         "features": extract_features(readme),
-        "installation": extract_installation(readme),
-        "usage": extract_usage(readme),
+        "installation": extract_installation(readme) if has_sections else "",
+        "usage": extract_usage(readme) if has_sections else "",
         "hasDocumentation": check_documentation(readme)
     }
     
@@ -278,6 +304,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Standard Lambda response with statusCode and body
     """
+    # Scheduled warm-up pings return before doing any work
+    if event.get('warmer') is True:
+        return {"statusCode": 200, "body": "warmed"}
+    
     try:
         print(f"[Service2] Starting README parser service")
         result = process_request(event)
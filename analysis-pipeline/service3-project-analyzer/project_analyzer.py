@@ -3,8 +3,30 @@ Service 3: Project Analyzer
 Analyzes project type and complexity based on GitHub data and parsed README
 """
 
+from bisect import bisect_left, bisect_right
 from typing import Dict, Any, List
 
+# Technologies recognised in topics and README features (built once per container)
+COMMON_TECH = ('react', 'vue', 'angular', 'nodejs', 'python', 'typescript',
+               'docker', 'kubernetes', 'aws', 'gcp', 'azure', 'postgresql',
+               'mongodb', 'redis', 'graphql', 'rest')
+
+# Complexity scoring: one point per threshold strictly exceeded
+STAR_THRESHOLDS = (100, 1000, 10000)
+FEATURE_THRESHOLDS = (5, 10)
+# Score cut-offs for "medium" (>= 3) and "high" (>= 5)
+COMPLEXITY_THRESHOLDS = (3, 5)
+COMPLEXITY_LABELS = ("low", "medium", "high")
+
+# Project type keyword groups, checked in priority order
+PROJECT_TYPE_KEYWORDS = (
+    ("framework", ('framework', 'ui framework', 'react', 'vue', 'angular')),
+    ("library", ('library', 'sdk', 'api client', 'wrapper')),
+    ("cli-tool", ('cli', 'command line', 'tool', 'utility')),
+    ("application", ('app', 'application', 'web app', 'desktop app')),
+    ("plugin", ('plugin', 'extension', 'addon')),
+)
+
 
 def determine_project_type(github_data: Dict[str, Any], parsed_readme: Dict[str, Any]) -> str:
     """
@@ -19,33 +41,18 @@ def determine_project_type(github_data: Dict[str, Any], parsed_readme: Dict[str,
     """
     # Check topics for hints
     topics = github_data.get('topics', [])
-    topic_lower = [t.lower() for t in topics]
     
     # Check README for keywords
-    readme_features = ' '.join(parsed_readme.get('features', [])).lower()
-    readme_title = parsed_readme.get('title', '').lower()
-    
-    all_text = ' '.join([readme_features, readme_title, ' '.join(topic_lower)]).lower()
-    
-    # Framework indicators
-    if any(keyword in all_text for keyword in ['framework', 'ui framework', 'react', 'vue', 'angular']):
-        return "framework"
-    
-    # Library indicators
-    if any(keyword in all_text for keyword in ['library', 'sdk', 'api client', 'wrapper']):
-        return "library"
-    
-    # CLI tool indicators
-    if any(keyword in all_text for keyword in ['cli', 'command line', 'tool', 'utility']):
-        return "cli-tool"
+    readme_features = ' '.join(parsed_readme.get('features', []))
+    readme_title = parsed_readme.get('title', '')
     
-    # Application indicators
-    if any(keyword in all_text for keyword in ['app', 'application', 'web app', 'desktop app']):
-        return "application"
+    # Lowercase the combined text once rather than each piece and then the whole
+    all_text = ' '.join([readme_features, readme_title, ' '.join(topics)]).lower()
     
-    # Plugin/Extension indicators
-    if any(keyword in all_text for keyword in ['plugin', 'extension', 'addon']):
-        return "plugin"
+    # Framework, library, CLI tool, application, then plugin/extension indicators
+    for project_type, keywords in PROJECT_TYPE_KEYWORDS:
+        if any(keyword in all_text for keyword in keywords):
+            return project_type
     
     # Default: library if it's a code repository
     if github_data.get('language'):
@@ -69,19 +76,11 @@ def determine_complexity(github_data: Dict[str, Any], parsed_readme: Dict[str, A
     
     # Stars as complexity indicator (popular projects tend to be more complex)
     stars = github_data.get('stars', 0)
-    if stars > 10000:
-        score += 3
-    elif stars > 1000:
-        score += 2
-    elif stars > 100:
-        score += 1
+    score += bisect_left(STAR_THRESHOLDS, stars)
     
     # Number of features
     features_count = len(parsed_readme.get('features', []))
-    if features_count > 10:
-        score += 2
-    elif features_count > 5:
-        score += 1
+    score += bisect_left(FEATURE_THRESHOLDS, features_count)
     
     # Documentation quality
     if parsed_readme.get('hasDocumentation'):
@@ -94,12 +93,7 @@ def determine_complexity(github_data: Dict[str, Any], parsed_readme: Dict[str, A
         score += 1
     
     # Determine complexity
-    if score >= 5:
-        return "high"
-    elif score >= 3:
-        return "medium"
-    else:
-        return "low"
+    return COMPLEXITY_LABELS[bisect_right(COMPLEXITY_THRESHOLDS, score)]
 
 
 def extract_tech_stack(github_data: Dict[str, Any], parsed_readme: Dict[str, Any]) -> List[str]:
@@ -114,31 +108,33 @@ def extract_tech_stack(github_data: Dict[str, Any], parsed_readme: Dict[str, Any
         List of technology names
     """
     tech_stack = []
+    seen = set()
+    
+    def add_tech(name: str) -> None:
+        if name not in seen:
+            seen.add(name)
+            tech_stack.append(name)
     
     # Add primary language
     language = github_data.get('language', '')
     if language:
-        tech_stack.append(language)
+        add_tech(language)
     
     # Extract from topics
     topics = github_data.get('topics', [])
-    common_tech = ['react', 'vue', 'angular', 'nodejs', 'python', 'typescript', 
-                   'docker', 'kubernetes', 'aws', 'gcp', 'azure', 'postgresql',
-                   'mongodb', 'redis', 'graphql', 'rest']
     
     for topic in topics:
         topic_lower = topic.lower()
         # Check if topic matches known technologies
-        for tech in common_tech:
+        for tech in COMMON_TECH:
             if tech in topic_lower:
-                if tech not in tech_stack:
-                    tech_stack.append(tech.capitalize())
+                add_tech(tech.capitalize())
     
     # Extract from README features
     features = ' '.join(parsed_readme.get('features', [])).lower()
-    for tech in common_tech:
-        if tech in features and tech.capitalize() not in tech_stack:
-            tech_stack.append(tech.capitalize())
+    for tech in COMMON_TECH:
+        if tech in features:
+            add_tech(tech.capitalize())
     
     return tech_stack[:10]  # Limit to 10 technologies
 
@@ -245,6 +241,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Standard Lambda response with statusCode and body
     """
+    # Scheduled warm-up pings return before doing any work
+    if event.get('warmer') is True:
+        return {"statusCode": 200, "body": "warmed"}
+    
     try:
         print(f"[Service3] Starting project analyzer service")
         result = process_request(event)
@@ -5,16 +5,22 @@ Manages DynamoDB cache for storing and retrieving cached data
 
 import json
 import os
+import time
 from typing import Dict, Any, Optional
 
 try:
     import boto3
+    from botocore.config import Config
     from botocore.exceptions import ClientError
 except ImportError:
     # For local testing without boto3
     boto3 = None
+    Config = None
     ClientError = Exception
 
+# DynamoDB table handle, created on first use and reused across warm invocations
+_table = None
+
 
 def get_dynamodb_table():
     """
@@ -23,14 +29,26 @@ def get_dynamodb_table():
     Returns:
         DynamoDB Table resource
     """
+    global _table
+    
     if boto3 is None:
         raise ImportError("boto3 is required for DynamoDB operations")
     
-    dynamodb = boto3.resource('dynamodb')
-    table_name = os.environ.get('DYNAMODB_TABLE', 'ai-demo-cache')
+    if _table is None:
+        dynamodb = boto3.resource(
+            'dynamodb',
+            config=Config(
+                max_pool_connections=50,
+                retries={'max_attempts': 3, 'mode': 'adaptive'},
+                tcp_keepalive=True
+            )
+        )
+        table_name = os.environ.get('DYNAMODB_TABLE', 'ai-demo-cache')
+        
+        print(f"[Service4] Connecting to DynamoDB table: {table_name}")
+        _table = dynamodb.Table(table_name)
     
-    print(f"[Service4] Connecting to DynamoDB table: {table_name}")
-    return dynamodb.Table(table_name)
+    return _table
 
 
 def get_cache_item(key: str) -> Optional[Dict[str, Any]]:
@@ -53,6 +71,14 @@ def get_cache_item(key: str) -> Optional[Dict[str, Any]]:
         
         if 'Item' in response:
             item = response['Item']
+            
+            # Expired items are removed by the table's TTL on 'ttl', but DynamoDB
+            # deletes them lazily, so treat them as a miss without a client-side delete
+            expires_at = item.get('ttl')
+            if expires_at is not None and int(expires_at) <= int(time.time()):
+                print(f"[Service4] Cache expired for key: {key}")
+                return None
+            
             # Extract the value (assuming it's stored in 'value' field)
             cached_value = item.get('value')
             print(f"[Service4] ✅ Cache hit for key: {key}")
@@ -70,7 +96,7 @@ def get_cache_item(key: str) -> Optional[Dict[str, Any]]:
 
 def set_cache_item(key: str, value: Any, ttl: Optional[int] = None) -> bool:
     """
-    Store item in cache
+    Store item in cache unless an unexpired entry already exists
     
     Args:
         key: Cache key
@@ -78,7 +104,7 @@ def set_cache_item(key: str, value: Any, ttl: Optional[int] = None) -> bool:
         ttl: Optional TTL in seconds (for DynamoDB TTL feature)
         
     Returns:
-        True if successful
+        True if the item was written, False if a live entry was already cached
     """
     try:
         table = get_dynamodb_table()
@@ -90,15 +116,24 @@ def set_cache_item(key: str, value: Any, ttl: Optional[int] = None) -> bool:
         
         # Add TTL if provided (DynamoDB requires timestamp, not seconds from now)
         if ttl:
-            import time
             item['ttl'] = int(time.time()) + ttl
         
-        table.put_item(Item=item)
+        # Only the first writer persists; concurrent or repeat sets of a live
+        # entry are rejected server-side instead of overwriting it
+        table.put_item(
+            Item=item,
+            ConditionExpression='attribute_not_exists(cacheKey) OR #ttl < :now',
+            ExpressionAttributeNames={'#ttl': 'ttl'},
+            ExpressionAttributeValues={':now': int(time.time())}
+        )
         print(f"[Service4] ✅ Cached item for key: {key}")
         return True
         
     except ClientError as e:
         error_code = e.response.get('Error', {}).get('Code', '')
+        if error_code == 'ConditionalCheckFailedException':
+            print(f"[Service4] Cache entry already present for key: {key}")
+            return False
         if error_code == 'ResourceNotFoundException':
             raise Exception(f"DynamoDB table not found. Please create table: {os.environ.get('DYNAMODB_TABLE', 'ai-demo-cache')}")
         raise Exception(f"DynamoDB error: {str(e)}")
@@ -165,10 +200,11 @@ def process_request(event: Dict[str, Any]) -> Dict[str, Any]:
         
         # Optional TTL (in seconds)
         ttl = event.get('ttl')
-        set_cache_item(key, value, ttl)
+        stored = set_cache_item(key, value, ttl)
         return {
             "success": True,
-            "key": key
+            "key": key,
+            "stored": stored
         }
     
     elif operation == 'delete':